@@ -2,12 +2,13 @@ import threading
 import time
 import requests
 import logging
-from typing import Dict
+from typing import Callable, Dict, Optional
 from src.db import collections as db
 from src.db.models import Instance, InstanceStatus
 
 class HealthChecker(threading.Thread):
-    def __init__(self, interval: int = 5, timeout: int = 2, retries: int = 3):
+    def __init__(self, interval: int = 5, timeout: int = 2, retries: int = 3,
+                 sleep_fn: Optional[Callable[[float], None]] = None):
         super().__init__(daemon=True)  # Run as daemon thread
         self.interval = interval
         self.timeout = timeout
@@ -15,6 +16,7 @@ class HealthChecker(threading.Thread):
         self.logger = logging.getLogger(__name__)
         self._stop_event = threading.Event()
         self._failed_checks: Dict[str, int] = {}  # instance_id -> failure count
+        self._sleep = sleep_fn or time.sleep  # Injectable so tests don't block
 
     def stop(self):
         """Stop the health checker thread."""
@@ -29,7 +31,7 @@ class HealthChecker(threading.Thread):
                 self.logger.error(f"Error in health check loop: {str(e)}")
             finally:
                 # Sleep for the interval period
-                time.sleep(self.interval)
+                self._sleep(self.interval)
 
     def _check_all_instances(self):
         """Check health of all instances."""
@@ -53,7 +55,7 @@ class HealthChecker(threading.Thread):
                 break
             except requests.RequestException as e:
                 self.logger.warning(f"Health check failed for {instance.addr}: {str(e)}")
-                time.sleep(1)  # Brief pause between retries
+                self._sleep(1)  # Brief pause between retries
 
         # Update instance status if it changed
         new_status = InstanceStatus.HEALTHY if is_healthy else InstanceStatus.UNHEALTHY
@@ -1,24 +1,59 @@
+import http.cookiejar
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Request, Response, stream_with_context
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 import logging
 from src.db.models import Instance
 
+# Headers that should not be forwarded to the backend
+_HOP_BY_HOP = frozenset({
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade'
+})
+
+# Client headers that are not copied as-is: hop-by-hop ones and those the proxy sets itself
+_NOT_COPIED = _HOP_BY_HOP | {'host', 'x-forwarded-for', 'x-forwarded-proto', 'x-forwarded-host'}
+
+# Backend response headers that must not be passed on to the client. The body is
+# re-streamed decoded, so encoding and length no longer describe what is sent
+_RESP_EXCLUDE = frozenset({
+    'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'
+})
+
+# Size of the chunks streamed back to the client. WSGI servers require each chunk to
+# be a bytes object, so buffers can't be reused; larger chunks mean fewer allocations
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+def _new_session() -> requests.Session:
+    """Create a session that keeps pooled keep-alive connections to the backends."""
+    session = requests.Session()
+    # Never store backend cookies: the session serves every client, so a Set-Cookie
+    # meant for one client would otherwise be replayed on other clients' requests
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    session.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=64))
+    return session
+
+# Connection pool shared by every handler that isn't given its own session
+_shared_session = _new_session()
+
 class ProxyHandler:
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, session: Optional[requests.Session] = None):
         self.timeout = timeout
         self.logger = logging.getLogger(__name__)
+        # Reuse pooled keep-alive connections to the backends across requests
+        self._session = session if session is not None else _shared_session
 
     def forward_request(self, client_request: Request, instance: Instance, path: str) -> Response:
         """Forward the request to the selected backend instance."""
-        url = f"http://{instance.addr}/{path.lstrip('/')}"
+        url = instance.base_url + path.lstrip('/')
         
         # Prepare headers - exclude hop-by-hop headers
-        headers = self._prepare_headers(dict(client_request.headers), instance)
+        headers = self._prepare_headers(client_request.headers, instance)
         
         try:
             # Forward the request to the backend
-            response = requests.request(
+            response = self._session.request(
                 method=client_request.method,
                 url=url,
                 headers=headers,
@@ -33,7 +68,7 @@ class ProxyHandler:
             
             # Stream the response back to the client
             return Response(
-                stream_with_context(response.iter_content(chunk_size=8192)),
+                stream_with_context(response.iter_content(chunk_size=_STREAM_CHUNK_SIZE)),
                 status=response.status_code,
                 headers=response_headers
             )
@@ -43,45 +78,31 @@ class ProxyHandler:
             # Re-raise the exception to be handled by the caller (LoadBalancer)
             raise e
 
-    def _prepare_headers(self, client_headers: Dict[str, str], instance: Instance) -> Dict[str, str]:
+    def _prepare_headers(self, client_headers: Mapping[str, str], instance: Instance) -> Dict[str, str]:
         """Prepare headers for the backend request."""
-        # Headers that should not be forwarded
-        hop_by_hop_headers = {
-            'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
-            'te', 'trailers', 'transfer-encoding', 'upgrade'
-        }
-        
-        # Copy headers, excluding hop-by-hop ones
+        # Copy headers in one pass, excluding hop-by-hop ones and those set below
         headers = {
             k: v for k, v in client_headers.items()
-            if k.lower() not in hop_by_hop_headers
+            if k.lower() not in _NOT_COPIED
         }
         
         # Update or set the Host header to match the backend server
         headers['Host'] = instance.addr
         
         # Add X-Forwarded headers
-        headers['X-Forwarded-For'] = headers.get('X-Forwarded-For', '')
-        if headers['X-Forwarded-For']:
-            headers['X-Forwarded-For'] += ', '
-        headers['X-Forwarded-For'] += headers.get('X-Real-IP', headers.get('Remote-Addr', ''))
+        forwarded_for = client_headers.get('X-Forwarded-For', '')
+        client_ip = client_headers.get('X-Real-IP', client_headers.get('Remote-Addr', ''))
+        headers['X-Forwarded-For'] = f"{forwarded_for}, {client_ip}" if forwarded_for else client_ip
         
-        headers['X-Forwarded-Proto'] = 'https' if headers.get('X-Forwarded-Proto') == 'https' else 'http'
-        headers['X-Forwarded-Host'] = headers.get('X-Forwarded-Host', client_headers.get('Host', ''))
+        headers['X-Forwarded-Proto'] = 'https' if client_headers.get('X-Forwarded-Proto') == 'https' else 'http'
+        headers['X-Forwarded-Host'] = client_headers.get('X-Forwarded-Host', client_headers.get('Host', ''))
         
         return headers
 
     def _prepare_response_headers(self, response_headers: Dict[str, str]) -> List[Tuple[str, str]]:
         """Prepare headers for the client response."""
-        excluded_headers = {
-            'content-encoding',
-            'content-length',
-            'transfer-encoding',
-            'connection'
-        }
-        
         return [
             (name, value)
             for name, value in response_headers.items()
-            if name.lower() not in excluded_headers
+            if name.lower() not in _RESP_EXCLUDE
         ]
\ No newline at end of file
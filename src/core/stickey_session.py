@@ -1,52 +1,123 @@
+import sys
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+# client_ip comes from X-Forwarded-For and may hold any text, but service IDs are generated
+# by the server and never contain NUL, so a key splits unambiguously at its last separator
+_KEY_SEPARATOR = '\x00'
+
+def _key(client_ip: str, service_id: str) -> str:
+    """Build the session key for a client and service."""
+    return f"{client_ip}{_KEY_SEPARATOR}{service_id}"
 
 class StickySessionManager:
-    def __init__(self, timeout_seconds: int = 300):
-        # Store mapping: (client_ip, service_id) -> (instance_id, timestamp)
-        self.sessions: Dict[Tuple[str, str], Tuple[str, float]] = {}
+    __slots__ = (
+        '_instances', '_timestamps', '_hot', '_hot_cap',
+        'timeout', 'cleanup_threshold', '_next_cleanup_size', '_now', '_lock'
+    )
+
+    def __init__(self, timeout_seconds: int = 300, cleanup_threshold: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        # Store mappings in parallel dicts keyed by _key(client_ip, service_id)
+        self._instances: Dict[str, str] = {}
+        self._timestamps: Dict[str, float] = {}
+        # Small LRU of recently used mappings probed before the main table
+        self._hot: "OrderedDict[str, str]" = OrderedDict()
+        self._hot_cap = 1024
         self.timeout = timeout_seconds
-        self._cleanup_interval = 60 # Run cleanup every 60 seconds
-        self._last_cleanup_time = time.time()
+        self.cleanup_threshold = cleanup_threshold
+        self._next_cleanup_size = cleanup_threshold # Sweep once this many sessions are stored
+        self._now = clock # Injectable so tests can control session age
+        # The manager is shared across request threads and updates span several dicts
+        self._lock = threading.Lock()
+
+    @property
+    def sessions(self) -> Dict[Tuple[str, str], Tuple[str, float]]:
+        """Snapshot of (client_ip, service_id) -> (instance_id, timestamp) mappings."""
+        with self._lock:
+            timestamps = self._timestamps
+            return {
+                tuple(key.rsplit(_KEY_SEPARATOR, 1)): (instance_id, timestamps[key])
+                for key, instance_id in self._instances.items()
+            }
 
     def get_sticky_instance(self, client_ip: str, service_id: str) -> Optional[str]:
         """Get the sticky instance ID for a client and service, if valid and not expired."""
-        self._cleanup_expired_sessions()
-        session_key = (client_ip, service_id)
-        if session_key in self.sessions:
-            instance_id, timestamp = self.sessions[session_key]
-            if time.time() - timestamp < self.timeout:
-                # Refresh timestamp on access
-                self.sessions[session_key] = (instance_id, time.time())
-                return instance_id
+        if client_ip is None or service_id is None:
+            return None
+        session_key = _key(client_ip, service_id)
+        with self._lock:
+            hot = self._hot
+            instance_id = hot.get(session_key)
+            if instance_id is not None:
+                hot.move_to_end(session_key)
             else:
-                # Session expired
-                del self.sessions[session_key]
+                instance_id = self._instances.get(session_key)
+            if instance_id is not None:
+                now = self._now()
+                if now - self._timestamps[session_key] < self.timeout:
+                    # Refresh timestamp on access
+                    self._timestamps[session_key] = now
+                    self._promote(session_key, instance_id)
+                    return instance_id
+                else:
+                    # Session expired
+                    self._delete(session_key)
         return None
 
     def set_sticky_instance(self, client_ip: str, service_id: str, instance_id: str):
         """Set or update the sticky instance for a client and service."""
-        session_key = (client_ip, service_id)
-        self.sessions[session_key] = (instance_id, time.time())
-        self._cleanup_expired_sessions() # Clean up periodically
+        if client_ip is None or service_id is None:
+            return
+        # Intern stored keys so later lookups compare against a cached hash
+        session_key = sys.intern(_key(client_ip, service_id))
+        with self._lock:
+            self._instances[session_key] = instance_id
+            now = self._now()
+            self._timestamps[session_key] = now
+            if session_key in self._hot:
+                self._hot[session_key] = instance_id
+            self._cleanup_expired_sessions(now) # Clean up once the table grows large
 
     def remove_sticky_instance(self, client_ip: str, service_id: str):
         """Remove a specific sticky session mapping."""
-        session_key = (client_ip, service_id)
-        if session_key in self.sessions:
-            del self.sessions[session_key]
-
-    def _cleanup_expired_sessions(self):
-        """Remove sessions that have exceeded the timeout."""
-        now = time.time()
-        # Avoid cleaning up too frequently
-        if now - self._last_cleanup_time < self._cleanup_interval:
+        if client_ip is None or service_id is None:
+            return
+        session_key = _key(client_ip, service_id)
+        with self._lock:
+            if session_key in self._instances:
+                self._delete(session_key)
+
+    def _promote(self, session_key: str, instance_id: str):
+        """Move a mapping into the hot cache, evicting the least recently used one. Caller holds _lock."""
+        hot = self._hot
+        if session_key in hot:
+            return
+        hot[session_key] = instance_id
+        if len(hot) > self._hot_cap:
+            hot.popitem(last=False)
+
+    def _delete(self, session_key: str):
+        """Drop a mapping from the main table and the hot cache. Caller holds _lock."""
+        del self._instances[session_key]
+        del self._timestamps[session_key]
+        self._hot.pop(session_key, None)
+
+    def _cleanup_expired_sessions(self, now: float):
+        """Remove sessions that have exceeded the timeout once the table grows large. Caller holds _lock."""
+        # Expired sessions are otherwise dropped lazily when they are looked up
+        if len(self._instances) < self._next_cleanup_size:
             return
 
-        expired_keys = [
-            key for key, (_, timestamp) in self.sessions.items()
-            if now - timestamp >= self.timeout
-        ]
-        for key in expired_keys:
-            del self.sessions[key]
-        self._last_cleanup_time = now
+        # Rebuild the tables in one pass rather than deleting expired keys one by one
+        timeout = self.timeout
+        live = self._timestamps = {
+            key: timestamp for key, timestamp in self._timestamps.items()
+            if now - timestamp < timeout
+        }
+        self._instances = {key: instance_id for key, instance_id in self._instances.items() if key in live}
+        self._hot = OrderedDict((key, instance_id) for key, instance_id in self._hot.items() if key in live)
+        # Grow the watermark with the live sessions so sweeps stay amortized O(1)
+        self._next_cleanup_size = max(self.cleanup_threshold, 2 * len(self._instances))
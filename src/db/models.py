@@ -24,6 +24,11 @@ class Instance(BaseModel):
     class Config:
         use_enum_values = True # Store enum values as strings in DB
 
+    @property
+    def base_url(self) -> str:
+        """Root URL of the instance, with trailing slash, for building proxied URLs."""
+        return f"http://{self.addr}/"
+
 class Service(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str # Should be compound unique with header
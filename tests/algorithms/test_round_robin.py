@@ -1,8 +1,16 @@
 import pytest
+import atexit
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.algorithms.round_robin import RoundRobinAlgorithm
 from src.db.models import Instance, InstanceStatus
 
 
+# Shared worker pool so concurrency tests don't pay thread startup per test
+_POOL = ThreadPoolExecutor(max_workers=8)
+atexit.register(_POOL.shutdown)
+
+
 def test_round_robin_select_instance(mock_instances):
     """Test that round robin selects instances in circular order"""
     algorithm = RoundRobinAlgorithm(mock_instances)
@@ -49,4 +57,23 @@ def test_round_robin_thread_safety(mock_instances):
     
     # Test that we can select instances while the lock is being used
     instance = algorithm.select_instance()
-    assert instance is not None 
\ No newline at end of file
+    assert instance is not None
+
+
+def test_round_robin_concurrent_selection(mock_instances):
+    """Verify that concurrent selections stay evenly distributed across instances"""
+    algorithm = RoundRobinAlgorithm(mock_instances)
+    workers, selections_per_worker = 8, 300
+
+    def select_many():
+        return [algorithm.select_instance().id for _ in range(selections_per_worker)]
+
+    futures = [_POOL.submit(select_many) for _ in range(workers)]
+    counts = Counter()
+    for future in as_completed(futures):
+        counts.update(future.result())
+
+    # Every selection is accounted for and no instance is starved or favoured
+    assert sum(counts.values()) == workers * selections_per_worker
+    assert set(counts) == {instance.id for instance in mock_instances}
+    assert max(counts.values()) - min(counts.values()) <= 1
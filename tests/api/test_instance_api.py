@@ -1,10 +1,51 @@
 import pytest
-import json
 from unittest.mock import patch, MagicMock
 from flask import Flask
 from src.api.instance import instance_bp
 from src.db.models import Instance, InstanceStatus, Service
 
+# Enum members bound once so test bodies use plain global lookups
+_HEALTHY = InstanceStatus.HEALTHY
+_UNHEALTHY = InstanceStatus.UNHEALTHY
+
+
+# Error messages returned by the instance API, compared by equality
+EXPECTED_ERRORS = {
+    "service_not_found": "Service not found",
+    "invalid_input": "Invalid input",
+    "invalid_status_input": "Invalid input, 'status' field required",
+    "missing_addr": "Missing required field: 'addr'",
+    "already_exists": "Instance with address '127.0.0.1:8080' already exists for this service",
+    "db_failed": "Database operation failed",
+    "unexpected": "An unexpected error occurred",
+    "instance_not_found": "Instance not found",
+    "wrong_service": "Instance not found within this service",
+    # Delete and status update report a missing instance with the same message as a wrong service
+    "missing_from_service": "Instance not found within this service",
+    "invalid_status": "Invalid status. Valid statuses are: ['healthy', 'unhealthy', 'unknown']",
+}
+
+# Instance returned by the mocked db.add_instance, built once without validation
+_CREATED_INSTANCE = Instance.model_construct(
+    id="instance123",
+    service_id="service123",
+    addr="127.0.0.1:8080",
+    status="healthy"
+)
+
+# Instance returned by the mocked db.update_instance_status
+_UNHEALTHY_INSTANCE = Instance.model_construct(
+    id="instance123",
+    service_id="service123",
+    addr="127.0.0.1:8080",
+    status=_UNHEALTHY.value
+)
+
+
+def _json(response):
+    """Return the parsed JSON body of a test response (cached by Flask)"""
+    return response.get_json()
+
 
 @pytest.fixture
 def app():
@@ -47,27 +88,23 @@ def test_create_instance_for_service(client, valid_instance_data):
         mock_db.get_service_by_id.return_value = mock_service
         
         # Mock the created instance
-        instance_data = valid_instance_data.copy()
-        instance_data['service_id'] = "service123"
-        instance_data['id'] = "instance123"
-        mock_instance = Instance(**instance_data)
-        mock_db.add_instance.return_value = mock_instance
+        mock_db.add_instance.return_value = _CREATED_INSTANCE
         
         # Make the API call
         response = client.post(
             '/services/service123/instances/',
-            data=json.dumps(valid_instance_data),
-            content_type='application/json'
+            json=valid_instance_data
         )
         
         # Check the response
         assert response.status_code == 201
-        response_data = json.loads(response.data)
+        response_data = _json(response)
         assert response_data["addr"] == "127.0.0.1:8080"
         assert response_data["service_id"] == "service123"
         
         # Verify the DB calls
-        mock_db.get_service_by_id.assert_called_once_with("service123")
+        assert mock_db.get_service_by_id.call_count == 1
+        assert mock_db.get_service_by_id.call_args.args == ("service123",)
         mock_db.add_instance.assert_called_once()
 
 
@@ -80,14 +117,13 @@ def test_create_instance_for_nonexistent_service(client, valid_instance_data):
         # Make the API call
         response = client.post(
             '/services/nonexistent/instances/',
-            data=json.dumps(valid_instance_data),
-            content_type='application/json'
+            json=valid_instance_data
         )
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "Service not found" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["service_not_found"]
 
 
 def test_create_instance_invalid_input(client):
@@ -100,14 +136,13 @@ def test_create_instance_invalid_input(client):
         # Make the API call with empty data
         response = client.post(
             '/services/service123/instances/',
-            data=json.dumps({}),
-            content_type='application/json'
+            json={}
         )
         
         # Check the response
         assert response.status_code == 400
-        response_data = json.loads(response.data)
-        assert "Invalid input" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["invalid_input"]
 
 
 def test_create_instance_missing_addr(client):
@@ -120,14 +155,13 @@ def test_create_instance_missing_addr(client):
         # Make the API call with missing addr
         response = client.post(
             '/services/service123/instances/',
-            data=json.dumps({"weight": 1}),
-            content_type='application/json'
+            json={"weight": 1}
         )
         
         # Check the response - should fail validation
         assert response.status_code == 400
-        response_data = json.loads(response.data)
-        assert "Missing required field: 'addr'" in str(response_data)
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["missing_addr"]
 
 
 def test_create_instance_duplicate(client, valid_instance_data):
@@ -144,14 +178,13 @@ def test_create_instance_duplicate(client, valid_instance_data):
         # Make the API call
         response = client.post(
             '/services/service123/instances/',
-            data=json.dumps(valid_instance_data),
-            content_type='application/json'
+            json=valid_instance_data
         )
         
         # Check the response
         assert response.status_code == 409
-        response_data = json.loads(response.data)
-        assert "already exists" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["already_exists"]
 
 
 def test_create_instance_database_error(client, valid_instance_data):
@@ -167,14 +200,13 @@ def test_create_instance_database_error(client, valid_instance_data):
         # Make the API call
         response = client.post(
             '/services/service123/instances/',
-            data=json.dumps(valid_instance_data),
-            content_type='application/json'
+            json=valid_instance_data
         )
         
         # Check the response
         assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "Database operation failed" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["db_failed"]
 
 
 def test_create_instance_unexpected_error(client, valid_instance_data):
@@ -190,14 +222,13 @@ def test_create_instance_unexpected_error(client, valid_instance_data):
         # Make the API call
         response = client.post(
             '/services/service123/instances/',
-            data=json.dumps(valid_instance_data),
-            content_type='application/json'
+            json=valid_instance_data
         )
         
         # Check the response
         assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "An unexpected error occurred" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["unexpected"]
 
 
 def test_get_instances_for_service(client):
@@ -214,7 +245,7 @@ def test_get_instances_for_service(client):
                 service_id="service123",
                 addr=f"127.0.0.1:{8000+i}",
                 weight=1,
-                status=InstanceStatus.HEALTHY
+                status=_HEALTHY
             )
             for i in range(3)
         ]
@@ -225,7 +256,7 @@ def test_get_instances_for_service(client):
         
         # Check the response
         assert response.status_code == 200
-        response_data = json.loads(response.data)
+        response_data = _json(response)
         assert len(response_data) == 3
         assert response_data[0]["addr"] == "127.0.0.1:8000"
         assert response_data[2]["addr"] == "127.0.0.1:8002"
@@ -242,8 +273,8 @@ def test_get_instances_service_not_found(client):
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "Service not found" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["service_not_found"]
 
 
 def test_get_instances_error(client):
@@ -261,8 +292,8 @@ def test_get_instances_error(client):
         
         # Check the response
         assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "An unexpected error occurred" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["unexpected"]
 
 
 def test_get_specific_instance(client):
@@ -274,7 +305,7 @@ def test_get_specific_instance(client):
             service_id="service123",
             addr="127.0.0.1:8080",
             weight=1,
-            status=InstanceStatus.HEALTHY
+            status=_HEALTHY
         )
         mock_db.get_instance_by_id.return_value = mock_instance
         
@@ -283,7 +314,7 @@ def test_get_specific_instance(client):
         
         # Check the response
         assert response.status_code == 200
-        response_data = json.loads(response.data)
+        response_data = _json(response)
         assert response_data["id"] == "instance123"
         assert response_data["addr"] == "127.0.0.1:8080"
 
@@ -299,8 +330,8 @@ def test_get_specific_instance_not_found(client):
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "Instance not found" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["instance_not_found"]
 
 
 def test_get_specific_instance_wrong_service(client):
@@ -312,7 +343,7 @@ def test_get_specific_instance_wrong_service(client):
             service_id="different_service",
             addr="127.0.0.1:8080",
             weight=1,
-            status=InstanceStatus.HEALTHY
+            status=_HEALTHY
         )
         mock_db.get_instance_by_id.return_value = mock_instance
         
@@ -321,8 +352,8 @@ def test_get_specific_instance_wrong_service(client):
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "Instance not found within this service" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["wrong_service"]
 
 
 def test_get_specific_instance_error(client):
@@ -336,8 +367,8 @@ def test_get_specific_instance_error(client):
         
         # Check the response
         assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "An unexpected error occurred" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["unexpected"]
 
 
 def test_delete_instance(client):
@@ -349,7 +380,7 @@ def test_delete_instance(client):
             service_id="service123",
             addr="127.0.0.1:8080",
             weight=1,
-            status=InstanceStatus.HEALTHY
+            status=_HEALTHY
         )
         mock_db.get_instance_by_id.return_value = mock_instance
         mock_db.delete_instance.return_value = True
@@ -359,8 +390,8 @@ def test_delete_instance(client):
         
         # Check the response
         assert response.status_code == 200
-        response_data = json.loads(response.data)
-        assert "deleted successfully" in response_data["message"]
+        response_data = _json(response)
+        assert response_data["message"] == "Instance deleted successfully"
 
 
 def test_delete_instance_not_found(client):
@@ -374,8 +405,8 @@ def test_delete_instance_not_found(client):
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "Instance not found" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["missing_from_service"]
 
 
 def test_delete_instance_wrong_service(client):
@@ -387,7 +418,7 @@ def test_delete_instance_wrong_service(client):
             service_id="different_service",
             addr="127.0.0.1:8080",
             weight=1,
-            status=InstanceStatus.HEALTHY
+            status=_HEALTHY
         )
         mock_db.get_instance_by_id.return_value = mock_instance
         
@@ -396,8 +427,8 @@ def test_delete_instance_wrong_service(client):
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "Instance not found within this service" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["wrong_service"]
 
 
 def test_delete_instance_db_error(client):
@@ -409,7 +440,7 @@ def test_delete_instance_db_error(client):
             service_id="service123",
             addr="127.0.0.1:8080",
             weight=1,
-            status=InstanceStatus.HEALTHY
+            status=_HEALTHY
         )
         mock_db.get_instance_by_id.return_value = mock_instance
         mock_db.delete_instance.side_effect = ConnectionError("Database error")
@@ -419,8 +450,8 @@ def test_delete_instance_db_error(client):
         
         # Check the response
         assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "Database operation failed" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["db_failed"]
 
 
 def test_update_instance_status(client):
@@ -432,25 +463,22 @@ def test_update_instance_status(client):
             service_id="service123",
             addr="127.0.0.1:8080",
             weight=1,
-            status=InstanceStatus.HEALTHY
+            status=_HEALTHY
         )
         mock_db.get_instance_by_id.return_value = mock_instance
         
         # Mock the updated instance
-        updated_instance = mock_instance.model_copy()
-        updated_instance.status = InstanceStatus.UNHEALTHY
-        mock_db.update_instance_status.return_value = updated_instance
+        mock_db.update_instance_status.return_value = _UNHEALTHY_INSTANCE
         
         # Make the API call
         response = client.put(
             '/services/service123/instances/instance123/status',
-            data=json.dumps({"status": "unhealthy"}),
-            content_type='application/json'
+            json={"status": "unhealthy"}
         )
         
         # Check the response
         assert response.status_code == 200
-        response_data = json.loads(response.data)
+        response_data = _json(response)
         assert response_data["status"] == "unhealthy"
 
 
@@ -459,14 +487,13 @@ def test_update_instance_status_invalid_input(client):
     # Make the API call with empty data
     response = client.put(
         '/services/service123/instances/instance123/status',
-        data=json.dumps({}),
-        content_type='application/json'
+        json={}
     )
     
     # Check the response
     assert response.status_code == 400
-    response_data = json.loads(response.data)
-    assert "Invalid input" in response_data["error"]
+    response_data = _json(response)
+    assert response_data["error"] == EXPECTED_ERRORS["invalid_status_input"]
 
 
 def test_update_instance_status_invalid_status(client):
@@ -474,14 +501,13 @@ def test_update_instance_status_invalid_status(client):
     # Make the API call with invalid status
     response = client.put(
         '/services/service123/instances/instance123/status',
-        data=json.dumps({"status": "invalid_status"}),
-        content_type='application/json'
+        json={"status": "invalid_status"}
     )
     
     # Check the response
     assert response.status_code == 400
-    response_data = json.loads(response.data)
-    assert "Invalid status" in response_data["error"]
+    response_data = _json(response)
+    assert response_data["error"] == EXPECTED_ERRORS["invalid_status"]
 
 
 def test_update_instance_status_not_found(client):
@@ -493,14 +519,13 @@ def test_update_instance_status_not_found(client):
         # Make the API call
         response = client.put(
             '/services/service123/instances/nonexistent/status',
-            data=json.dumps({"status": "unhealthy"}),
-            content_type='application/json'
+            json={"status": "unhealthy"}
         )
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "Instance not found" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["missing_from_service"]
 
 
 def test_update_instance_status_wrong_service(client):
@@ -512,21 +537,20 @@ def test_update_instance_status_wrong_service(client):
             service_id="different_service",
             addr="127.0.0.1:8080",
             weight=1,
-            status=InstanceStatus.HEALTHY
+            status=_HEALTHY
         )
         mock_db.get_instance_by_id.return_value = mock_instance
         
         # Make the API call
         response = client.put(
             '/services/service123/instances/instance123/status',
-            data=json.dumps({"status": "unhealthy"}),
-            content_type='application/json'
+            json={"status": "unhealthy"}
         )
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "Instance not found within this service" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["wrong_service"]
 
 
 def test_update_instance_status_db_error(client):
@@ -538,7 +562,7 @@ def test_update_instance_status_db_error(client):
             service_id="service123",
             addr="127.0.0.1:8080",
             weight=1,
-            status=InstanceStatus.HEALTHY
+            status=_HEALTHY
         )
         mock_db.get_instance_by_id.return_value = mock_instance
         mock_db.update_instance_status.side_effect = ConnectionError("Database error")
@@ -546,11 +570,10 @@ def test_update_instance_status_db_error(client):
         # Make the API call
         response = client.put(
             '/services/service123/instances/instance123/status',
-            data=json.dumps({"status": "unhealthy"}),
-            content_type='application/json'
+            json={"status": "unhealthy"}
         )
         
         # Check the response
         assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "Database operation failed" in response_data["error"] 
\ No newline at end of file
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["db_failed"]
\ No newline at end of file
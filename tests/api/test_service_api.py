@@ -1,24 +1,28 @@
 import pytest
-import json
 from unittest.mock import patch, MagicMock
-from flask import Flask
-from src.api.service import service_bp
 from src.db.models import Service, Algorithm
 
+# Enum members bound once so test bodies use plain global lookups
+_RR = Algorithm.ROUND_ROBIN
+_IP_HASH = Algorithm.IP_HASH
 
-@pytest.fixture
-def app():
-    """Create a Flask app with the service blueprint registered"""
-    app = Flask(__name__)
-    app.config['TESTING'] = True
-    app.register_blueprint(service_bp)
-    return app
+
+# Error messages returned by the service API, compared by equality
+EXPECTED_ERRORS = {
+    "service_not_found": "Service not found",
+    "already_exists": "Service with this name already exists",
+}
+
+
+def _json(response):
+    """Return the parsed JSON body of a test response (cached by Flask)"""
+    return response.get_json()
 
 
 @pytest.fixture
-def client(app):
-    """Create a test client for the Flask app"""
-    return app.test_client()
+def client(service_app):
+    """Create a test client for the shared service API app"""
+    return service_app.test_client()
 
 
 def test_create_service(client):
@@ -41,13 +45,12 @@ def test_create_service(client):
         # Make the API call
         response = client.post(
             '/services/',
-            data=json.dumps(service_data),
-            content_type='application/json'
+            json=service_data
         )
         
         # Check the response
         assert response.status_code == 201
-        response_data = json.loads(response.data)
+        response_data = _json(response)
         assert response_data["name"] == "test-service"
         assert response_data["algorithm"] == "round_robin"
         
@@ -76,14 +79,13 @@ def test_create_service_duplicate(client):
         # Make the API call
         response = client.post(
             '/services/',
-            data=json.dumps(service_data),
-            content_type='application/json'
+            json=service_data
         )
         
         # Check the response
         assert response.status_code == 409  # Conflict
-        response_data = json.loads(response.data)
-        assert "already exists" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["already_exists"]
 
 
 def test_get_services(client):
@@ -96,7 +98,7 @@ def test_get_services(client):
                 name="Service 1",
                 header="s1.example.com",
                 domain="s1.example.com",
-                algorithm=Algorithm.ROUND_ROBIN,
+                algorithm=_RR,
                 stateful=False
             ),
             Service(
@@ -104,7 +106,7 @@ def test_get_services(client):
                 name="Service 2",
                 header="s2.example.com",
                 domain="s2.example.com",
-                algorithm=Algorithm.IP_HASH,
+                algorithm=_IP_HASH,
                 stateful=True
             )
         ]
@@ -116,7 +118,7 @@ def test_get_services(client):
         
         # Check the response
         assert response.status_code == 200
-        response_data = json.loads(response.data)
+        response_data = _json(response)
         assert len(response_data) == 2
         assert response_data[0]["name"] == "Service 1"
         assert response_data[1]["name"] == "Service 2"
@@ -131,7 +133,7 @@ def test_get_service_by_id(client):
             name="Test Service",
             header="test.example.com",
             domain="test.example.com",
-            algorithm=Algorithm.ROUND_ROBIN,
+            algorithm=_RR,
             stateful=False
         )
         
@@ -142,7 +144,7 @@ def test_get_service_by_id(client):
         
         # Check the response
         assert response.status_code == 200
-        response_data = json.loads(response.data)
+        response_data = _json(response)
         assert response_data["id"] == "service123"
         assert response_data["name"] == "Test Service"
 
@@ -157,8 +159,8 @@ def test_get_service_by_id_not_found(client):
         
         # Check the response
         assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "not found" in response_data["error"]
+        response_data = _json(response)
+        assert response_data["error"] == EXPECTED_ERRORS["service_not_found"]
 
 
 def test_update_service(client):
@@ -176,7 +178,7 @@ def test_update_service(client):
             name="Updated Service",
             header="test.example.com",
             domain="test.example.com",
-            algorithm=Algorithm.IP_HASH,
+            algorithm=_IP_HASH,
             stateful=False
         )
         
@@ -185,19 +187,19 @@ def test_update_service(client):
         # Make the API call
         response = client.put(
             '/services/service123',
-            data=json.dumps(update_data),
-            content_type='application/json'
+            json=update_data
         )
         
         # Check the response
         assert response.status_code == 200
-        response_data = json.loads(response.data)
+        response_data = _json(response)
         assert response_data["name"] == "Updated Service"
         assert response_data["algorithm"] == "ip_hash"
         
         # Verify the DB call with correct parameters
-        mock_db.update_service.assert_called_once_with(
-            "service123", 
+        assert mock_db.update_service.call_count == 1
+        assert mock_db.update_service.call_args.args == (
+            "service123",
             {"name": "Updated Service", "algorithm": "ip_hash"}
         )
 
@@ -212,8 +214,9 @@ def test_delete_service(client):
         
         # Check the response
         assert response.status_code == 200
-        response_data = json.loads(response.data)
-        assert "deleted successfully" in response_data["message"]
+        response_data = _json(response)
+        assert response_data["message"] == "Service and associated instances deleted successfully"
         
         # Verify the DB call
-        mock_db.delete_service.assert_called_once_with("service123") 
\ No newline at end of file
+        assert mock_db.delete_service.call_count == 1
+        assert mock_db.delete_service.call_args.args == ("service123",) 
\ No newline at end of file
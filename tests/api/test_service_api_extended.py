@@ -1,348 +1,215 @@
 import pytest
-import json
-from unittest.mock import patch, MagicMock
-from flask import Flask
-from src.api.service import service_bp
-from src.db.models import Service, Algorithm
+import orjson
+from collections import namedtuple
+from pymongo.errors import DuplicateKeyError
+from werkzeug.test import EnvironBuilder
 
 
-@pytest.fixture
-def app():
-    """Create a Flask app with the service blueprint registered"""
-    app = Flask(__name__)
-    app.config['TESTING'] = True
-    app.register_blueprint(service_bp)
-    return app
+# Valid service creation payload shared by the error-path tests
+SERVICE_PAYLOAD = {
+    "name": "test-service",
+    "header": "test.example.com",
+    "domain": "test.example.com",
+    "algorithm": "round_robin",
+    "stateful": False
+}
+
+# Request bodies serialized once at import time
+_SERVICE_BODY = orjson.dumps(SERVICE_PAYLOAD)
+_UPDATE_NAME_BODY = orjson.dumps({"name": "Updated Service"})
+_EMPTY_BODY = b"{}"
+
+
+def _post(client, path, body):
+    """POST a pre-serialized JSON body"""
+    return client.post(path, data=body, content_type='application/json')
+
+
+def _put(client, path, body):
+    """PUT a pre-serialized JSON body"""
+    return client.put(path, data=body, content_type='application/json')
+
+
+def _json(response):
+    """Parse a test response body with orjson"""
+    return orjson.loads(response.data)
+
+
+# Minimal response returned by _call; unpacks as (status_code, data)
+_WsgiResult = namedtuple('_WsgiResult', 'status_code data')
+
+
+def _call(app, method, path, body=None):
+    """Call the WSGI app directly, returning (status code, body bytes)"""
+    environ = EnvironBuilder(path=path, method=method, data=body,
+                             content_type='application/json').get_environ()
+    status = []
+    chunks = []
+
+    def start_response(status_line, headers, exc_info=None):
+        status.append(status_line)
+        return chunks.append
+
+    app_iter = app.wsgi_app(environ, start_response)
+    try:
+        chunks.extend(app_iter)
+    finally:
+        if hasattr(app_iter, 'close'):
+            app_iter.close()
+    return _WsgiResult(int(status[0].split()[0]), b"".join(chunks))
+
+
+def assert_error(response, code, needle):
+    """Assert the response has the given status and its error message contains needle"""
+    assert response.status_code == code
+    assert needle in orjson.loads(response.data)["error"]
 
 
 @pytest.fixture
-def client(app):
-    """Create a test client for the Flask app"""
-    return app.test_client()
+def client(service_app):
+    """Create a test client for the shared service API app"""
+    return service_app.test_client()
 
 
 def test_create_service_missing_field(client):
     """Test creating a service with validation errors (missing fields)"""
-    with patch('src.api.service.db') as mock_db:
-        # Service data with missing required fields
-        service_data = {
-            "name": "test-service"
-            # missing header, domain, algorithm
-        }
-        
-        # Make the API call
-        response = client.post(
-            '/services/',
-            data=json.dumps(service_data),
-            content_type='application/json'
-        )
-        
-        # Check the response
-        assert response.status_code == 400
-        response_data = json.loads(response.data)
-        assert "error" in response_data
-
-
-def test_create_service_empty_payload(client):
+    # Service data with missing required fields
+    service_data = {
+        "name": "test-service"
+        # missing header, domain, algorithm
+    }
+    
+    # Make the API call
+    response = _post(client, '/services/', orjson.dumps(service_data))
+    
+    # Check the response
+    assert response.status_code == 400
+    response_data = _json(response)
+    assert "error" in response_data
+
+
+def test_create_service_empty_payload(service_app):
     """Test creating a service with an empty payload"""
     # Make the API call with empty data
-    response = client.post(
-        '/services/',
-        data=json.dumps({}),
-        content_type='application/json'
-    )
+    response = _call(service_app, 'POST', '/services/', _EMPTY_BODY)
     
     # Check the response
-    assert response.status_code == 400
-    response_data = json.loads(response.data)
-    assert "Invalid input" in response_data["error"]
-
-
-def test_create_service_db_error(client):
-    """Test creating a service with a database error"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise a connection error
-        mock_db.add_service.side_effect = ConnectionError("Database connection error")
-        
-        # Service data
-        service_data = {
-            "name": "test-service",
-            "header": "test.example.com",
-            "domain": "test.example.com",
-            "algorithm": "round_robin",
-            "stateful": False
-        }
-        
-        # Make the API call
-        response = client.post(
-            '/services/',
-            data=json.dumps(service_data),
-            content_type='application/json'
-        )
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "Database operation failed" in response_data["error"]
-
-
-def test_create_service_unexpected_error(client):
-    """Test creating a service with an unexpected error"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise an unexpected error
-        mock_db.add_service.side_effect = Exception("Unexpected error")
-        
-        # Service data
-        service_data = {
-            "name": "test-service",
-            "header": "test.example.com",
-            "domain": "test.example.com",
-            "algorithm": "round_robin",
-            "stateful": False
-        }
-        
-        # Make the API call
-        response = client.post(
-            '/services/',
-            data=json.dumps(service_data),
-            content_type='application/json'
-        )
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "An unexpected error occurred" in response_data["error"]
-
-
-def test_get_services_error(client):
-    """Test handling of errors when retrieving all services"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise an error
-        mock_db.get_all_services.side_effect = Exception("Database error")
-        
-        # Make the API call
-        response = client.get('/services/')
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "An unexpected error occurred" in response_data["error"]
-
-
-def test_get_service_db_error(client):
-    """Test handling of database errors when retrieving a service by ID"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise a connection error
-        mock_db.get_service_by_id.side_effect = ConnectionError("Database connection error")
-        
-        # Make the API call
-        response = client.get('/services/service123')
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "Database operation failed" in response_data["error"]
-
-
-def test_get_service_unexpected_error(client):
-    """Test handling of unexpected errors when retrieving a service by ID"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise an unexpected error
-        mock_db.get_service_by_id.side_effect = Exception("Unexpected error")
-        
-        # Make the API call
-        response = client.get('/services/service123')
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "An unexpected error occurred" in response_data["error"]
-
-
-def test_get_service_by_hdr(client):
+    assert_error(response, 400, "Invalid input")
+
+
+@pytest.mark.parametrize("method,path,db_attr,body", [
+    ("post", "/services/", "add_service", _SERVICE_BODY),
+    ("get", "/services/service123", "get_service_by_id", None),
+    ("get", "/services/header/test.example.com", "get_service_by_header", None),
+    ("put", "/services/service123", "update_service", _UPDATE_NAME_BODY),
+    ("delete", "/services/service123", "delete_service", None),
+])
+def test_endpoint_db_error(service_app, _db_mock, method, path, db_attr, body):
+    """Test that database connection errors on each endpoint return a 500"""
+    # Configure mock to raise a connection error
+    getattr(_db_mock, db_attr).side_effect = ConnectionError("Database connection error")
+    
+    # Make the API call
+    response = _call(service_app, method.upper(), path, body)
+    
+    # Check the response
+    assert_error(response, 500, "Database operation failed")
+
+
+@pytest.mark.parametrize("method,path,db_method,body", [
+    ("post", "/services/", "add_service", _SERVICE_BODY),
+    ("get", "/services/", "get_all_services", None),
+    ("get", "/services/service123", "get_service_by_id", None),
+    ("delete", "/services/service123", "delete_service", None),
+])
+def test_unexpected_error(service_app, _db_mock, method, path, db_method, body):
+    """Test that unexpected errors on each endpoint return a generic 500"""
+    # Configure mock to raise an unexpected error
+    getattr(_db_mock, db_method).side_effect = Exception("Unexpected error")
+    
+    # Make the API call
+    response = _call(service_app, method.upper(), path, body)
+    
+    # Check the response
+    assert_error(response, 500, "An unexpected error occurred")
+
+
+def test_get_service_by_hdr(client, _db_mock, mock_service):
     """Test retrieving a service by header"""
-    with patch('src.api.service.db') as mock_db:
-        # Mock service
-        service = Service(
-            id="service123",
-            name="Test Service",
-            header="test.example.com",
-            domain="test.example.com",
-            algorithm=Algorithm.ROUND_ROBIN,
-            stateful=False
-        )
-        
-        mock_db.get_service_by_header.return_value = service
-        
-        # Make the API call
-        response = client.get('/services/header/test.example.com')
-        
-        # Check the response
-        assert response.status_code == 200
-        response_data = json.loads(response.data)
-        assert response_data["id"] == "service123"
-        assert response_data["name"] == "Test Service"
-
-
-def test_get_service_by_hdr_not_found(client):
+    _db_mock.get_service_by_header.return_value = mock_service
+    
+    # Make the API call
+    response = client.get('/services/header/test.example.com')
+    
+    # Check the response
+    assert response.status_code == 200
+    response_data = _json(response)
+    assert response_data["id"] == "service123"
+    assert response_data["name"] == "test-service"
+
+
+def test_get_service_by_hdr_not_found(client, _db_mock):
     """Test retrieving a non-existent service by header"""
-    with patch('src.api.service.db') as mock_db:
-        mock_db.get_service_by_header.return_value = None
-        
-        # Make the API call
-        response = client.get('/services/header/nonexistent.example.com')
-        
-        # Check the response
-        assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "not found" in response_data["error"]
-
-
-def test_get_service_by_hdr_db_error(client):
-    """Test handling of database errors when retrieving a service by header"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise a connection error
-        mock_db.get_service_by_header.side_effect = ConnectionError("Database connection error")
-        
-        # Make the API call
-        response = client.get('/services/header/test.example.com')
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "Database operation failed" in response_data["error"]
-
-
-def test_update_service_empty_payload(client):
+    _db_mock.get_service_by_header.return_value = None
+    
+    # Make the API call
+    response = client.get('/services/header/nonexistent.example.com')
+    
+    # Check the response
+    assert_error(response, 404, "not found")
+
+
+def test_update_service_empty_payload(service_app):
     """Test updating a service with an empty payload"""
     # Make the API call with empty data
-    response = client.put(
-        '/services/service123',
-        data=json.dumps({}),
-        content_type='application/json'
-    )
+    response = _call(service_app, 'PUT', '/services/service123', _EMPTY_BODY)
     
     # Check the response
-    assert response.status_code == 400
-    response_data = json.loads(response.data)
-    assert "Invalid input" in response_data["error"]
+    assert_error(response, 400, "Invalid input")
 
 
 def test_update_service_invalid_algorithm(client):
     """Test updating a service with an invalid algorithm"""
     # Make the API call with invalid algorithm
-    response = client.put(
-        '/services/service123',
-        data=json.dumps({"algorithm": "invalid_algorithm"}),
-        content_type='application/json'
-    )
+    response = _put(client, '/services/service123', orjson.dumps({"algorithm": "invalid_algorithm"}))
     
     # Check the response
-    assert response.status_code == 400
-    response_data = json.loads(response.data)
-    assert "Invalid algorithm" in response_data["error"]
+    assert_error(response, 400, "Invalid algorithm")
 
 
-def test_update_service_service_not_found(client):
+def test_update_service_service_not_found(client, _db_mock):
     """Test updating a non-existent service"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise a value error (service not found)
-        mock_db.update_service.side_effect = ValueError("Service not found")
-        
-        # Make the API call
-        response = client.put(
-            '/services/nonexistent',
-            data=json.dumps({"name": "Updated Service"}),
-            content_type='application/json'
-        )
-        
-        # Check the response
-        assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "not found" in str(response_data["error"]).lower()
-
-
-def test_update_service_duplicate(client):
+    # Configure mock to raise a value error (service not found)
+    _db_mock.update_service.side_effect = ValueError("Service not found")
+    
+    # Make the API call
+    response = _put(client, '/services/nonexistent', _UPDATE_NAME_BODY)
+    
+    # Check the response
+    assert_error(response, 404, "not found")
+
+
+def test_update_service_duplicate(client, _db_mock):
     """Test updating a service with a duplicate name/header"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise DuplicateKeyError
-        from pymongo.errors import DuplicateKeyError
-        mock_db.update_service.side_effect = DuplicateKeyError(
-            "E11000 duplicate key error collection: test.services index: name_1 dup key: { name: \"another-service\" }"
-        )
-        
-        # Make the API call
-        response = client.put(
-            '/services/service123',
-            data=json.dumps({"name": "another-service"}),
-            content_type='application/json'
-        )
-        
-        # Check the response
-        assert response.status_code == 409
-        response_data = json.loads(response.data)
-        assert "already has this" in response_data["error"]
-
-
-def test_update_service_db_error(client):
-    """Test updating a service with a database error"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise a connection error
-        mock_db.update_service.side_effect = ConnectionError("Database connection error")
-        
-        # Make the API call
-        response = client.put(
-            '/services/service123',
-            data=json.dumps({"name": "Updated Service"}),
-            content_type='application/json'
-        )
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "Database operation failed" in response_data["error"]
-
-
-def test_delete_service_not_found(client):
+    # Configure mock to raise DuplicateKeyError
+    _db_mock.update_service.side_effect = DuplicateKeyError(
+        "E11000 duplicate key error collection: test.services index: name_1 dup key: { name: \"another-service\" }"
+    )
+    
+    # Make the API call
+    response = _put(client, '/services/service123', orjson.dumps({"name": "another-service"}))
+    
+    # Check the response
+    assert_error(response, 409, "already has this")
+
+
+def test_delete_service_not_found(client, _db_mock):
     """Test deleting a non-existent service"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to return False (service not found)
-        mock_db.delete_service.return_value = False
-        
-        # Make the API call
-        response = client.delete('/services/nonexistent')
-        
-        # Check the response
-        assert response.status_code == 404
-        response_data = json.loads(response.data)
-        assert "not found" in response_data["error"]
-
-
-def test_delete_service_db_error(client):
-    """Test deleting a service with a database error"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise a connection error
-        mock_db.delete_service.side_effect = ConnectionError("Database connection error")
-        
-        # Make the API call
-        response = client.delete('/services/service123')
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "Database operation failed" in response_data["error"]
-
-
-def test_delete_service_unexpected_error(client):
-    """Test deleting a service with an unexpected error"""
-    with patch('src.api.service.db') as mock_db:
-        # Configure mock to raise an unexpected error
-        mock_db.delete_service.side_effect = Exception("Unexpected error")
-        
-        # Make the API call
-        response = client.delete('/services/service123')
-        
-        # Check the response
-        assert response.status_code == 500
-        response_data = json.loads(response.data)
-        assert "An unexpected error occurred" in response_data["error"] 
\ No newline at end of file
+    # Configure mock to return False (service not found)
+    _db_mock.delete_service.return_value = False
+    
+    # Make the API call
+    response = client.delete('/services/nonexistent')
+    
+    # Check the response
+    assert_error(response, 404, "not found")
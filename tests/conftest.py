@@ -1,40 +1,53 @@
 import pytest
 import sys
 import os
-from unittest.mock import MagicMock
-from flask import Flask, Request
+from unittest.mock import create_autospec
+from types import SimpleNamespace
+from flask import Flask
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.db.models import Service, Instance, Algorithm, InstanceStatus
+from src.api import service as _svc_mod
+from src.core import balancer as _bal_mod
+from src.core.proxy import ProxyHandler
+from src.db import collections as _db_collections
+
+
+# Shared service model; tests needing a variant use SERVICE_TEMPLATE.model_copy(update=...)
+SERVICE_TEMPLATE = Service(
+    id="service123",
+    name="test-service",
+    header="test.example.com",
+    domain="test.example.com",
+    algorithm=Algorithm.ROUND_ROBIN,
+    stateful=False
+)
 
 
 @pytest.fixture
 def mock_service():
-    """Returns a mock service object for testing"""
-    return Service(
-        id="service123",
-        name="test-service",
-        header="test.example.com",
-        domain="test.example.com",
-        algorithm=Algorithm.ROUND_ROBIN,
-        stateful=False
-    )
+    """Returns a per-test copy of the service template, safe to mutate"""
+    return SERVICE_TEMPLATE.model_copy()
 
 
 @pytest.fixture
+def mock_stateful_service():
+    """Returns a copy of the service template with sticky sessions enabled"""
+    return SERVICE_TEMPLATE.model_copy(update={"stateful": True})
+
+
+@pytest.fixture(scope="session")
 def mock_instances():
-    """Returns a list of mock instances for testing"""
-    return [
-        Instance(
+    """Returns an immutable tuple of mock instances shared across the test session"""
+    return tuple(
+        Instance.model_construct(
             id=f"instance{i}",
             service_id="service123",
             addr=f"127.0.0.1:{8000+i}",
-            weight=1,
-            status=InstanceStatus.HEALTHY,
-            connections=0
+            status=InstanceStatus.HEALTHY.value
         )
         for i in range(3)
-    ]
+    )
 
 
 @pytest.fixture
@@ -45,26 +58,46 @@ def flask_app():
     return app
 
 
+@pytest.fixture(scope="session")
+def service_app():
+    """Creates a Flask app with the service blueprint registered, once per session"""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.register_blueprint(_svc_mod.service_bp)
+    return app
+
+
+@pytest.fixture(scope="session")
+def proxy_handler():
+    """Creates a ProxyHandler sharing the process-wide connection pool"""
+    return ProxyHandler(timeout=5)
+
+
 @pytest.fixture
 def mock_request():
-    """Creates a mock Flask request"""
-    request = MagicMock(spec=Request)
-    request.headers = {'Host': 'test.example.com'}
-    request.method = 'GET'
-    request.remote_addr = '192.168.1.1'
-    request.path = '/'
-    request.args = {}
-    request.form = {}
-    request.data = b''
-    return request
+    """Creates a lightweight stand-in for a Flask request"""
+    return SimpleNamespace(
+        headers={'Host': 'test.example.com'},
+        method='GET',
+        remote_addr='192.168.1.1',
+        path='/',
+        args={},
+        form={},
+        data=b''
+    )
 
 
-@pytest.fixture
-def mock_db_collections():
-    """Mock the database collections module"""
-    mock_db = MagicMock()
-    mock_db.get_service_by_header.return_value = None
-    mock_db.get_instances_by_service.return_value = []
-    mock_db.get_all_services.return_value = []
-    mock_db.update_instance_status = MagicMock()
-    return mock_db 
\ No newline at end of file
+@pytest.fixture(scope="session")
+def _db_spec():
+    """Autospecced stand-in for src.db.collections, built once per session"""
+    return create_autospec(_db_collections)
+
+
+@pytest.fixture(autouse=True)
+def _db_mock(monkeypatch, _db_spec):
+    """Install one shared database mock for the service API and the balancer"""
+    mock_db = _db_spec
+    monkeypatch.setattr(_svc_mod, 'db', mock_db)
+    monkeypatch.setattr(_bal_mod, 'db', mock_db)
+    yield mock_db
+    mock_db.reset_mock(return_value=True, side_effect=True)
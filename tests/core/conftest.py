@@ -0,0 +1,51 @@
+import pytest
+import requests
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from src.core import balancer as balancer_module
+from src.core.balancer import LoadBalancer
+
+
+@pytest.fixture(scope="module")
+def _shared_load_balancer():
+    """Creates a LoadBalancer with mocked components once per test module"""
+    mocks = SimpleNamespace(
+        proxy_handler=MagicMock(),
+        sticky_session_manager=MagicMock(),
+        get_config=MagicMock(return_value={'lb': {'timeout': 10}})
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(balancer_module, 'ProxyHandler', mocks.proxy_handler)
+        mp.setattr(balancer_module, 'StickySessionManager', mocks.sticky_session_manager)
+        mp.setattr(balancer_module, 'get_config', mocks.get_config)
+        balancer = LoadBalancer()
+
+        # Store mocks for test access
+        balancer._mock_proxy = mocks.proxy_handler.return_value
+        balancer._mock_sticky = mocks.sticky_session_manager.return_value
+
+        yield balancer
+
+
+@pytest.fixture
+def load_balancer(_shared_load_balancer):
+    """Returns the module's shared LoadBalancer with its component mocks reset"""
+    _shared_load_balancer._mock_proxy.reset_mock(return_value=True, side_effect=True)
+    _shared_load_balancer._mock_sticky.reset_mock(return_value=True, side_effect=True)
+    return _shared_load_balancer
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_requests():
+    """Patch the health checker's requests module once per test module"""
+    with patch('src.core.health_checker.requests') as mock_requests:
+        # Keep the real exception class so the checker's except clause still matches
+        mock_requests.RequestException = requests.RequestException
+        yield mock_requests
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_requests(mock_requests):
+    """Clear recorded calls and configured behaviour after each test"""
+    yield
+    mock_requests.reset_mock(return_value=True, side_effect=True)
@@ -1,17 +1,22 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock, call
 import time
 import logging
 import requests
 from src.core.health_checker import HealthChecker
-from src.db.models import Instance, InstanceStatus, Service
+from src.db.models import InstanceStatus, Service
 
 
-@pytest.fixture
+def _no_sleep(seconds):
+    """Stand-in for time.sleep so retries and loop pauses don't block"""
+
+
+@pytest.fixture(scope="module")
 def mock_instances():
     """Return a list of mock instances for testing"""
     return [
-        Instance(
+        SimpleNamespace(
             id=f"instance{i}",
             service_id="service123",
             addr=f"127.0.0.1:{8000+i}",
@@ -38,63 +43,48 @@ def mock_services():
     ]
 
 
-@pytest.fixture
-def health_checker():
-    """Return a HealthChecker with mocked db"""
+@pytest.fixture(scope="module", autouse=True)
+def mock_db():
+    """Patch the health checker's db module once for the whole module"""
     with patch('src.core.health_checker.db') as mock_db:
-        # Create health checker with proper parameters
-        checker = HealthChecker(interval=5)
-        # Avoid actually starting the thread
-        checker._stop_event.set()
-        yield checker, mock_db
+        yield mock_db
 
 
-def test_health_checker_check_instance_connection_error(health_checker, mock_instances):
-    """Test the health checker handling a connection error during instance check"""
-    checker, mock_db = health_checker
-    instance = mock_instances[0]
-    
-    # Mock requests to raise a connection error
-    with patch('src.core.health_checker.requests.get') as mock_get:
-        mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
-        
-        # Check the instance directly
-        checker._check_instance(instance)
-        
-        # Verify that connection error was handled correctly
-        mock_db.update_instance_status.assert_called_once_with(instance.id, InstanceStatus.UNHEALTHY)
+@pytest.fixture(autouse=True)
+def _reset_mock_db(mock_db):
+    """Clear recorded calls and configured behaviour after each test"""
+    yield
+    mock_db.reset_mock(return_value=True, side_effect=True)
 
 
-def test_health_checker_check_instance_timeout(health_checker, mock_instances):
-    """Test the health checker handling a timeout during instance check"""
-    checker, mock_db = health_checker
-    instance = mock_instances[0]
-    
-    # Mock requests to raise a timeout
-    with patch('src.core.health_checker.requests.get') as mock_get:
-        mock_get.side_effect = requests.exceptions.Timeout("Request timed out")
-        
-        # Check the instance directly
-        checker._check_instance(instance)
-        
-        # Verify that timeout was handled correctly
-        mock_db.update_instance_status.assert_called_once_with(instance.id, InstanceStatus.UNHEALTHY)
+@pytest.fixture(scope="module")
+def health_checker(mock_db):
+    """Return a HealthChecker with mocked db, shared across the module"""
+    # Create health checker with proper parameters
+    checker = HealthChecker(interval=5, sleep_fn=_no_sleep)
+    # Avoid actually starting the thread
+    checker._stop_event.set()
+    return checker, mock_db
 
 
-def test_health_checker_check_instance_request_exception(health_checker, mock_instances):
-    """Test the health checker handling a generic request exception during instance check"""
+@pytest.mark.parametrize("exc", [
+    requests.exceptions.ConnectionError("Connection refused"),
+    requests.exceptions.Timeout("Request timed out"),
+    requests.exceptions.RequestException("Generic error"),
+], ids=["connection_error", "timeout", "request_exception"])
+def test_health_checker_check_instance_request_error(health_checker, mock_instances, mock_requests, exc):
+    """Test the health checker handling a request error during instance check"""
     checker, mock_db = health_checker
     instance = mock_instances[0]
     
-    # Mock requests to raise a generic exception
-    with patch('src.core.health_checker.requests.get') as mock_get:
-        mock_get.side_effect = requests.exceptions.RequestException("Generic error")
-        
-        # Check the instance directly
-        checker._check_instance(instance)
-        
-        # Verify that exception was handled correctly
-        mock_db.update_instance_status.assert_called_once_with(instance.id, InstanceStatus.UNHEALTHY)
+    # Mock requests to raise the error
+    mock_requests.get.side_effect = exc
+    
+    # Check the instance directly
+    checker._check_instance(instance)
+    
+    # Verify that the error was handled correctly
+    mock_db.update_instance_status.assert_called_once_with(instance.id, InstanceStatus.UNHEALTHY)
 
 
 def test_health_checker_mark_unhealthy(health_checker):
@@ -123,26 +113,25 @@ def test_health_checker_mark_unhealthy_error(health_checker):
         assert mock_log.called
 
 
-def test_health_checker_run_method(health_checker):
+def test_health_checker_run_method():
     """Test the run method of the health checker"""
-    checker, _ = health_checker
+    mock_sleep = MagicMock()
+    checker = HealthChecker(interval=5, sleep_fn=mock_sleep)
     
-    # Mock _check_all_instances and sleep to avoid actual execution
-    with patch.object(checker, '_check_all_instances') as mock_check, \
-         patch('time.sleep') as mock_sleep, \
-         patch.object(checker, '_stop_event') as mock_stop_event:
-        
-        # Configure stop event to be set after one iteration
-        mock_stop_event.is_set.side_effect = [False, True]
-        
-        # Run the method
-        checker.run()
-        
-        # Verify that _check_all_instances was called
-        mock_check.assert_called_once()
-        
-        # Verify that sleep was called with the interval
-        mock_sleep.assert_called_once_with(checker.interval)
+    # Mock _check_all_instances to avoid actual execution
+    checker._check_all_instances = MagicMock()
+    # Configure stop event to be set after one iteration
+    checker._stop_event = MagicMock()
+    checker._stop_event.is_set.side_effect = [False, True]
+    
+    # Run the method
+    checker.run()
+    
+    # Verify that _check_all_instances was called
+    checker._check_all_instances.assert_called_once()
+    
+    # Verify that sleep was called with the interval
+    mock_sleep.assert_called_once_with(checker.interval)
 
 
 def test_health_checker_check_all_method(health_checker, mock_services, mock_instances):
@@ -160,8 +149,9 @@ def test_health_checker_check_all_method(health_checker, mock_services, mock_ins
         
         # Verify _check_instance was called for each instance
         assert mock_check_instance.call_count == len(mock_instances)
-        for instance in mock_instances:
-            mock_check_instance.assert_any_call(instance)
+        # SimpleNamespace is unhashable, so compare the checked instances by id
+        assert ({c.args[0].id for c in mock_check_instance.call_args_list} ==
+                {instance.id for instance in mock_instances})
 
 
 def test_health_checker_check_all_instances_db_error(health_checker):
@@ -1,8 +1,12 @@
 import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, Mock, MagicMock
-from src.core.proxy import ProxyHandler
+from src.core.proxy import ProxyHandler, _STREAM_CHUNK_SIZE
 from src.db.models import Instance
+from flask import has_request_context
 import requests
+from requests.structures import CaseInsensitiveDict
 
 # Flask Response might need some mocking
 class MockResponse:
@@ -14,37 +18,39 @@ class MockResponse:
     def __iter__(self):
         yield self.data
 
-@pytest.fixture
-def proxy_handler():
-    return ProxyHandler(timeout=5)
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_instance():
     return Instance(id="test-instance", service_id="test-service", addr="127.0.0.1:8080", weight=1, status="healthy")
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_request():
     mock_req = Mock()
     mock_req.method = "GET"
-    mock_req.headers = {
+    mock_req.headers = CaseInsensitiveDict({
         "Host": "example.com",
         "User-Agent": "test-agent",
         "Connection": "keep-alive",  # Hop-by-hop header that should be filtered
         "X-Real-IP": "192.168.1.10"
-    }
+    })
     mock_req.cookies = {}
     mock_req.get_data = Mock(return_value=b"")
     return mock_req
 
+@pytest.fixture
+def mock_request_fn(proxy_handler):
+    with patch.object(proxy_handler._session, 'request') as mock_request_fn:
+        yield mock_request_fn
+
 def test_prepare_headers(proxy_handler, mock_instance, mock_request):
     # Test header preparation
-    headers = proxy_handler._prepare_headers(dict(mock_request.headers), mock_instance)
+    headers = proxy_handler._prepare_headers(mock_request.headers, mock_instance)
     
     # Host should be replaced with the instance address
     assert headers["Host"] == mock_instance.addr
     
-    # Hop-by-hop headers should be removed
+    # Hop-by-hop headers should be removed, whatever their case
     assert "Connection" not in headers
+    assert "connection" not in headers
     
     # X-Forwarded headers should be added
     assert "X-Forwarded-For" in headers
@@ -52,6 +58,20 @@ def test_prepare_headers(proxy_handler, mock_instance, mock_request):
     assert "X-Forwarded-Proto" in headers
     assert "X-Forwarded-Host" in headers
 
+def test_instance_base_url_follows_addr(mock_instance):
+    # The URL prefix is derived from the current address, never cached
+    assert mock_instance.base_url == "http://127.0.0.1:8080/"
+    moved = mock_instance.model_copy(update={"addr": "127.0.0.1:9090"})
+    assert moved.base_url == "http://127.0.0.1:9090/"
+
+def test_proxy_handlers_share_connection_pool(proxy_handler):
+    # Handlers without an explicit session reuse the process-wide pool
+    assert proxy_handler._session is ProxyHandler()._session
+    
+    # An explicit session is used as given
+    session = requests.Session()
+    assert ProxyHandler(session=session)._session is session
+
 def test_prepare_response_headers(proxy_handler):
     # Create mock response headers
     response_headers = {
@@ -71,10 +91,8 @@ def test_prepare_response_headers(proxy_handler):
     assert "content-length" not in header_names
     assert "connection" not in header_names
 
-@pytest.mark.skip(reason="Requires Flask request context")
-@patch("requests.request")
 @patch("src.core.proxy.Response")
-def test_forward_request_success(mock_response_cls, mock_request_fn, proxy_handler, mock_instance, mock_request):
+def test_forward_request_success(mock_response_cls, mock_request_fn, proxy_handler, mock_instance, mock_request, flask_app):
     # Setup mock response
     mock_response = Mock()
     mock_response.status_code = 200
@@ -87,10 +105,14 @@ def test_forward_request_success(mock_response_cls, mock_request_fn, proxy_handl
     mock_flask_response = MockResponse()
     mock_response_cls.return_value = mock_flask_response
     
-    # Forward request
-    response = proxy_handler.forward_request(mock_request, mock_instance, "test/path")
+    # Forward request (stream_with_context needs an active request context)
+    with flask_app.test_request_context():
+        response = proxy_handler.forward_request(mock_request, mock_instance, "test/path")
+        # Close the streamed body so it pops the request context it pushed
+        mock_response_cls.call_args.args[0].close()
+    assert not has_request_context()
     
-    # Check that requests.request was called with correct arguments
+    # Check that the session request was called with correct arguments
     mock_request_fn.assert_called_once()
     call_args = mock_request_fn.call_args[1]
     assert call_args["method"] == "GET"
@@ -98,10 +120,12 @@ def test_forward_request_success(mock_response_cls, mock_request_fn, proxy_handl
     assert call_args["timeout"] == 5
     assert call_args["stream"] is True
     
+    # Check that the body is streamed in large chunks
+    mock_response.iter_content.assert_called_once_with(chunk_size=_STREAM_CHUNK_SIZE)
+    
     # Check that Flask Response was called
     mock_response_cls.assert_called_once()
 
-@patch("requests.request")
 def test_forward_request_error(mock_request_fn, proxy_handler, mock_instance, mock_request):
     # Setup request to raise an exception
     mock_request_fn.side_effect = requests.RequestException("Connection error")
@@ -110,10 +134,8 @@ def test_forward_request_error(mock_request_fn, proxy_handler, mock_instance, mo
     with pytest.raises(requests.RequestException):
         proxy_handler.forward_request(mock_request, mock_instance, "test/path")
 
-@pytest.mark.skip(reason="Requires Flask request context")
-@patch("requests.request")
 @patch("src.core.proxy.Response")
-def test_forward_request_with_path_normalization(mock_response_cls, mock_request_fn, proxy_handler, mock_instance, mock_request):
+def test_forward_request_with_path_normalization(mock_response_cls, mock_request_fn, proxy_handler, mock_instance, mock_request, flask_app):
     # Setup mock response
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -125,7 +147,55 @@ def test_forward_request_with_path_normalization(mock_response_cls, mock_request
     mock_response_cls.return_value = mock_flask_response
     
     # Test with path that has leading slash
-    proxy_handler.forward_request(mock_request, mock_instance, "/test/path")
+    with flask_app.test_request_context():
+        proxy_handler.forward_request(mock_request, mock_instance, "/test/path")
+        # Close the streamed body so it pops the request context it pushed
+        mock_response_cls.call_args.args[0].close()
+    assert not has_request_context()
     
     # Verify the correct URL was used (leading slash should be removed)
-    assert mock_request_fn.call_args[1]["url"] == "http://127.0.0.1:8080/test/path" 
\ No newline at end of file
+    assert mock_request_fn.call_args[1]["url"] == "http://127.0.0.1:8080/test/path" 
+
+class _CookieBackend(BaseHTTPRequestHandler):
+    """Backend that sets a session cookie on /login and records received Cookie headers"""
+    received_cookies = []
+
+    def do_GET(self):
+        type(self).received_cookies.append(self.headers.get('Cookie'))
+        self.send_response(200)
+        if self.path == '/login':
+            self.send_header('Set-Cookie', 'session=ALICE; Path=/')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def cookie_backend():
+    _CookieBackend.received_cookies = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _CookieBackend)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield Instance(id="cookie-backend", service_id="test-service", addr=f"127.0.0.1:{server.server_address[1]}")
+    server.shutdown()
+    server.server_close()
+
+def test_forward_request_does_not_leak_backend_cookies(proxy_handler, cookie_backend, flask_app):
+    # Two different clients, neither sending cookies of its own
+    def client_request():
+        req = Mock()
+        req.method = "GET"
+        req.headers = CaseInsensitiveDict({"Host": "example.com"})
+        req.cookies = {}
+        req.get_data = Mock(return_value=b"")
+        return req
+    
+    for path in ("login", "profile"):
+        with flask_app.test_request_context():
+            response = proxy_handler.forward_request(client_request(), cookie_backend, path)
+            response.get_data()
+            response.close()
+    
+    # The cookie set for the first client must not be replayed for the second
+    assert _CookieBackend.received_cookies == [None, None]
@@ -87,4 +87,22 @@ def test_sticky_session_with_empty_values():
     
     # Try to remove with None values (should not raise errors)
     manager.remove_sticky_instance(None, "service1")
-    manager.remove_sticky_instance("192.168.1.1", None) 
\ No newline at end of file
+    manager.remove_sticky_instance("192.168.1.1", None)
+    
+    # Setting with None values stores nothing, so a literal "None" client can't collide
+    manager.set_sticky_instance(None, "service1", "instance2")
+    assert manager.get_sticky_instance("None", "service1") is None
+    assert ("None", "service1") not in manager.sessions 
+
+def test_sticky_session_client_ip_containing_separator():
+    """Test that a client IP containing NUL still maps to its own session"""
+    manager = StickySessionManager()
+    
+    # X-Forwarded-For is client controlled, so the IP may contain the key separator
+    manager.set_sticky_instance("1.2.3.4\x00service1", "service2", "instance1")
+    manager.set_sticky_instance("1.2.3.4", "service1", "instance2")
+    
+    assert manager.get_sticky_instance("1.2.3.4\x00service1", "service2") == "instance1"
+    assert manager.get_sticky_instance("1.2.3.4", "service1") == "instance2"
+    assert manager.sessions[("1.2.3.4\x00service1", "service2")][0] == "instance1"
+    assert manager.sessions[("1.2.3.4", "service1")][0] == "instance2"
@@ -1,5 +1,6 @@
 import pytest
-from unittest.mock import patch, MagicMock
+import sys
+import threading
 import time
 from src.core.stickey_session import StickySessionManager
 
@@ -9,64 +10,62 @@ def test_sticky_session_cleanup_expired():
     # Create manager with a short timeout
     manager = StickySessionManager(timeout_seconds=1)
     
-    # Replace the _last_cleanup_time with a real value instead of a mock
-    current_time = time.time()
-    manager._last_cleanup_time = current_time
+    current_time = time.monotonic()
     
     # Add some sessions
     manager.set_sticky_instance("client1", "service1", "instance1")
     manager.set_sticky_instance("client2", "service1", "instance2")
     
-    # Force time to advance
-    with patch('time.time') as mock_time:
-        # First timestamp is current
-        mock_time.return_value = current_time
-        
-        # Verify sessions exist
-        assert manager.get_sticky_instance("client1", "service1") == "instance1"
-        assert manager.get_sticky_instance("client2", "service1") == "instance2"
-        
-        # Move time forward past expiration
-        mock_time.return_value = current_time + 2  # More than the 1 second timeout
-        
-        # Try to access session (should trigger cleanup and return None)
-        assert manager.get_sticky_instance("client1", "service1") is None
-        assert manager.get_sticky_instance("client2", "service1") is None
-        
-        # Verify sessions were removed
-        assert len(manager.sessions) == 0
-
-
-def test_sticky_session_cleanup_interval():
-    """Test that cleanup only runs at specific intervals"""
-    # Create manager with cleanup settings
-    manager = StickySessionManager(timeout_seconds=10)
-    manager._cleanup_interval = 5  # Run cleanup every 5 seconds
+    # Pin the clock to the current time
+    manager._now = lambda: current_time
     
-    # Set an initial timestamp
-    current_time = time.time()
-    manager._last_cleanup_time = current_time
+    # Verify sessions exist
+    assert manager.get_sticky_instance("client1", "service1") == "instance1"
+    assert manager.get_sticky_instance("client2", "service1") == "instance2"
     
-    # Add a session
-    with patch('time.time') as mock_time:
-        mock_time.return_value = current_time
-        manager.set_sticky_instance("client1", "service1", "instance1")
-        
-        # Move time forward but less than the cleanup interval
-        mock_time.return_value = current_time + 2
-        
-        # This shouldn't run the cleanup even though we're calling set again
-        with patch.object(manager, '_cleanup_expired_sessions') as mock_cleanup:
-            manager.set_sticky_instance("client2", "service2", "instance2")
-            mock_cleanup.assert_called_once()  # Called because we're calling set_sticky_instance
-        
-        # Move time past the cleanup interval
-        mock_time.return_value = current_time + 6
-        
-        # This should run the cleanup
-        with patch.object(manager, '_cleanup_expired_sessions') as mock_cleanup:
-            manager.set_sticky_instance("client3", "service3", "instance3")
-            mock_cleanup.assert_called_once()
+    # Move time forward past expiration
+    manager._now = lambda: current_time + 2  # More than the 1 second timeout
+    
+    # Try to access session (should expire the touched key and return None)
+    assert manager.get_sticky_instance("client1", "service1") is None
+    assert manager.get_sticky_instance("client2", "service1") is None
+    
+    # Verify sessions were removed
+    assert len(manager.sessions) == 0
+
+
+def test_sticky_session_cleanup_threshold():
+    """Test that the full cleanup only sweeps once the session table reaches the threshold"""
+    # Create manager with a small cleanup threshold
+    manager = StickySessionManager(timeout_seconds=10, cleanup_threshold=3)
+    
+    current_time = time.monotonic()
+    manager._now = lambda: current_time
+    manager.set_sticky_instance("client1", "service1", "instance1")
+    manager.set_sticky_instance("client2", "service2", "instance2")
+    
+    # Move time past expiration
+    manager._now = lambda: current_time + 11
+    
+    # Below the threshold, expired sessions are kept until they are touched
+    assert len(manager.sessions) == 2
+    
+    # Reaching the threshold sweeps out the expired sessions
+    manager.set_sticky_instance("client3", "service3", "instance3")
+    assert set(manager.sessions) == {("client3", "service3")}
+
+
+def test_sticky_session_cleanup_threshold_grows_with_live_sessions():
+    """Test that the sweep watermark grows when most sessions are still live"""
+    manager = StickySessionManager(timeout_seconds=10, cleanup_threshold=2)
+    
+    # Reaching the threshold sweeps, but nothing has expired
+    manager.set_sticky_instance("client1", "service1", "instance1")
+    manager.set_sticky_instance("client2", "service2", "instance2")
+    assert len(manager.sessions) == 2
+    
+    # The watermark doubles so the next writes don't sweep again
+    assert manager._next_cleanup_size == 4
 
 
 def test_sticky_session_refresh_timestamp():
@@ -75,26 +74,25 @@ def test_sticky_session_refresh_timestamp():
     manager = StickySessionManager(timeout_seconds=10)
     
     # Add a session
-    current_time = time.time()
-    with patch('time.time') as mock_time:
-        # Set initial timestamp
-        mock_time.return_value = current_time
-        manager.set_sticky_instance("client1", "service1", "instance1")
-        
-        # Original timestamp should be current_time
-        session_key = ("client1", "service1")
-        _, timestamp = manager.sessions[session_key]
-        assert timestamp == current_time
-        
-        # Move time forward
-        mock_time.return_value = current_time + 5
-        
-        # Access the session (should refresh timestamp)
-        assert manager.get_sticky_instance("client1", "service1") == "instance1"
-        
-        # Timestamp should be updated
-        _, new_timestamp = manager.sessions[session_key]
-        assert new_timestamp == current_time + 5
+    current_time = time.monotonic()
+    # Set initial timestamp
+    manager._now = lambda: current_time
+    manager.set_sticky_instance("client1", "service1", "instance1")
+    
+    # Original timestamp should be current_time
+    session_key = ("client1", "service1")
+    _, timestamp = manager.sessions[session_key]
+    assert timestamp == current_time
+    
+    # Move time forward
+    manager._now = lambda: current_time + 5
+    
+    # Access the session (should refresh timestamp)
+    assert manager.get_sticky_instance("client1", "service1") == "instance1"
+    
+    # Timestamp should be updated
+    _, new_timestamp = manager.sessions[session_key]
+    assert new_timestamp == current_time + 5
 
 
 def test_sticky_session_expired_during_access():
@@ -103,32 +101,26 @@ def test_sticky_session_expired_during_access():
     manager = StickySessionManager(timeout_seconds=5)
     
     # Add a session
-    current_time = time.time()
-    # Set an initial timestamp
-    manager._last_cleanup_time = current_time
-    
-    with patch('time.time') as mock_time:
-        # Set initial timestamp
-        mock_time.return_value = current_time
-        manager.set_sticky_instance("client1", "service1", "instance1")
-        
-        # Move time past expiration
-        mock_time.return_value = current_time + 6
-        
-        # Try to access the expired session
-        assert manager.get_sticky_instance("client1", "service1") is None
-        
-        # Verify session was removed
-        assert ("client1", "service1") not in manager.sessions
+    current_time = time.monotonic()
+    
+    # Set initial timestamp
+    manager._now = lambda: current_time
+    manager.set_sticky_instance("client1", "service1", "instance1")
+    
+    # Move time past expiration
+    manager._now = lambda: current_time + 6
+    
+    # Try to access the expired session
+    assert manager.get_sticky_instance("client1", "service1") is None
+    
+    # Verify session was removed
+    assert ("client1", "service1") not in manager.sessions
 
 
 def test_sticky_session_with_empty_client_ip():
     """Test setting a sticky session with an empty client IP"""
     manager = StickySessionManager()
     
-    # Set an initial timestamp to avoid mocking issues
-    manager._last_cleanup_time = time.time()
-    
     # Try with empty client IP
     manager.set_sticky_instance("", "service1", "instance1")
     
@@ -146,11 +138,102 @@ def test_sticky_session_remove_nonexistent():
     """Test removing a nonexistent sticky session"""
     manager = StickySessionManager()
     
-    # Set an initial timestamp to avoid mocking issues
-    manager._last_cleanup_time = time.time()
-    
     # Remove a session that doesn't exist (should not raise an error)
     manager.remove_sticky_instance("nonexistent", "nonexistent")
     
     # Verify no issues
-    assert manager.get_sticky_instance("nonexistent", "nonexistent") is None 
\ No newline at end of file
+    assert manager.get_sticky_instance("nonexistent", "nonexistent") is None 
+
+def test_sticky_session_hot_cache_bounded_lru():
+    """Test that the hot cache keeps only the most recently used mappings"""
+    manager = StickySessionManager()
+    manager._hot_cap = 2
+    
+    for i in range(3):
+        manager.set_sticky_instance(f"client{i}", "service1", f"instance{i}")
+        assert manager.get_sticky_instance(f"client{i}", "service1") == f"instance{i}"
+    
+    # The least recently used mapping was evicted from the hot cache only
+    assert len(manager._hot) == 2
+    assert manager.get_sticky_instance("client0", "service1") == "instance0"
+
+
+def test_sticky_session_hot_cache_follows_updates_and_removals():
+    """Test that the hot cache never serves a stale or removed mapping"""
+    manager = StickySessionManager()
+    
+    manager.set_sticky_instance("client1", "service1", "instance1")
+    assert manager.get_sticky_instance("client1", "service1") == "instance1"
+    
+    # Re-pinning the client updates the cached mapping
+    manager.set_sticky_instance("client1", "service1", "instance2")
+    assert manager.get_sticky_instance("client1", "service1") == "instance2"
+    
+    # Removing the mapping also drops it from the hot cache
+    manager.remove_sticky_instance("client1", "service1")
+    assert manager.get_sticky_instance("client1", "service1") is None
+    assert len(manager._hot) == 0
+
+
+def test_sticky_session_concurrent_access():
+    """Test that concurrent set/get/remove on the same key never raises"""
+    manager = StickySessionManager()
+    errors = []
+    
+    def worker(n):
+        try:
+            for _ in range(2000):
+                manager.set_sticky_instance("client1", "service1", f"instance{n}")
+                manager.get_sticky_instance("client1", "service1")
+                manager.remove_sticky_instance("client1", "service1")
+        except Exception as e:
+            errors.append(e)
+    
+    # Switch threads as often as possible to expose unguarded multi-step updates
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    
+    assert errors == []
+
+
+def test_sticky_session_hot_cache_concurrent_eviction():
+    """Test that concurrent promotion, eviction and removal keep the hot cache consistent"""
+    manager = StickySessionManager()
+    manager._hot_cap = 4
+    errors = []
+    
+    def worker(n):
+        try:
+            for i in range(3000):
+                client_ip = f"client{i % 16}"
+                manager.set_sticky_instance(client_ip, "service1", f"instance{n}")
+                manager.get_sticky_instance(client_ip, "service1")
+                if i % 3 == n % 3:
+                    manager.remove_sticky_instance(client_ip, "service1")
+        except Exception as e:
+            errors.append(e)
+    
+    # Switch threads as often as possible to interleave the LRU updates
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    
+    assert errors == []
+    # Every hot entry is still backed by the main table and the cap holds
+    assert len(manager._hot) <= 4
+    assert all(manager._instances.get(key) == value for key, value in manager._hot.items())